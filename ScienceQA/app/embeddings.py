@@ -0,0 +1,40 @@
+import os
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+MODEL_DIR = "models/all-MiniLM-L6-v2-int8"
+QUANTIZED_FILE = "model_quantized.onnx"
+MAX_SEQ_LENGTH = 256
+def export_quantized_model(model_dir=MODEL_DIR):
+    print(f"Exporting {MODEL_NAME} to int8 ONNX in {model_dir}...")
+    model = ORTModelForFeatureExtraction.from_pretrained(MODEL_NAME, export=True)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=model_dir, quantization_config=qconfig)
+    AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(model_dir)
+class QuantizedEmbeddingFunction(EmbeddingFunction[Documents]):
+    def __init__(self, model_dir=MODEL_DIR):
+        if not os.path.exists(os.path.join(model_dir, QUANTIZED_FILE)):
+            export_quantized_model(model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(model_dir, file_name=QUANTIZED_FILE)
+    def encode(self, texts, batch_size=32):
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQ_LENGTH,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            chunks.append(pooled / np.linalg.norm(pooled, axis=1, keepdims=True))
+        return np.concatenate(chunks).astype(np.float32)
+    def __call__(self, input: Documents) -> Embeddings:
+        return list(self.encode(list(input)))
\ No newline at end of file
@@ -1,30 +1,39 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from app.models import QueryRequest, ContextResponse, QuizRequest, AnalysisRequest
-from app.rag_engine import search_knowledge
+from app.rag_engine import search_knowledge, start_batcher, stop_batcher, warm_up
 from app.quiz_engine import generate_quiz, analyze_performance
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(warm_up)
+    await start_batcher()
+    yield
+    await stop_batcher()
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 @app.get("/")
 def home():
     return {"status": "Online", "message": "AI Tutor Backend is running"}
 @app.post("/retrieve", response_model=ContextResponse)
-def retrieve_context(request: QueryRequest):
+async def retrieve_context(request: QueryRequest):
     print(f"Received query: {request.question_text}")
     try:
-        context, topic = search_knowledge(request.question_text)
-        return ContextResponse(
-            answer_context=context,
-            source_topic=topic,
-            confidence_score=0.95
-        )
+        context, topic = await search_knowledge(request.question_text)
+        return ORJSONResponse({
+            "answer_context": context,
+            "source_topic": topic,
+            "confidence_score": 0.95
+        })
     except Exception as e:
         print(f"Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 @app.post("/quiz/generate")
-def get_quiz(request: QuizRequest):
-    questions = generate_quiz(request.topic, request.difficulty)
-    return {"quiz": questions}
+async def get_quiz(request: QuizRequest):
+    questions = await asyncio.to_thread(generate_quiz, request.topic, request.difficulty)
+    return ORJSONResponse({"quiz": questions})
 @app.post("/quiz/analyze")
-def submit_results(request: AnalysisRequest):
+async def submit_results(request: AnalysisRequest):
     results_data = [item.dict() for item in request.results]
     feedback = analyze_performance(results_data)
-    return {"feedback": feedback}
+    return ORJSONResponse({"feedback": feedback})
\ No newline at end of file
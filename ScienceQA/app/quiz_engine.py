@@ -1,40 +1,69 @@
-import pandas as pd
-import json
+import numpy as np
+import orjson
 import random
+from functools import lru_cache
+from pathlib import Path
+from pyarrow import feather
 DATA_FILE = "data/cleaned_exam.json"
+FEATHER_FILE = "data/cleaned_exam.feather"
+TEMPLATES = (
+    "Weakness detected in {}. Review the lecture notes.",
+    "Good progress in {}. Keep practicing.",
+    "Perfect score in {}! Moving to advanced mode."
+)
+def load_records():
+    if not Path(FEATHER_FILE).exists():
+        return orjson.loads(Path(DATA_FILE).read_bytes())
+    records = feather.read_table(FEATHER_FILE).to_pylist()
+    for record in records:
+        if record.get('choices'):
+            record['choices'] = {k: v for k, v in record['choices'].items() if v is not None}
+    return records
 try:
-    df = pd.read_json(DATA_FILE)
-    print(f"Quiz Engine Loaded: {len(df)} questions available.")
+    RECORDS = load_records()
+    print(f"Quiz Engine Loaded: {len(RECORDS)} questions available.")
 except Exception as e:
     print(f"Error loading quiz data: {e}")
-    df = pd.DataFrame() 
+    RECORDS = []
+def _build_topic_index(records):
+    index = {}
+    for i, record in enumerate(records):
+        topic = record.get('topic')
+        if topic is not None:
+            index.setdefault(str(topic).lower(), []).append(i)
+    return index
+def _build_substring_index(keys):
+    substrings = {}
+    for key in keys:
+        for start in range(len(key)):
+            for end in range(start + 1, len(key) + 1):
+                substrings.setdefault(key[start:end], {})[key] = None
+    return {sub: list(keys) for sub, keys in substrings.items()}
+TOPIC_INDEX = _build_topic_index(RECORDS)
+TOPIC_SUBSTRINGS = _build_substring_index(TOPIC_INDEX)
+ALL_RECORDS = range(len(RECORDS))
+@lru_cache(maxsize=1024)
+def _resolve_topic(topic: str):
+    keys = TOPIC_SUBSTRINGS.get(topic, [])
+    return tuple(i for k in keys for i in TOPIC_INDEX[k])
 def generate_quiz(topic: str, difficulty: str = "Medium", num_questions: int = 5):
-    if df.empty:
+    if not RECORDS:
         return []
-    topic_df = df[df['topic'].str.contains(topic, case=False, na=False)]
-    if topic_df.empty:
+    idxs = _resolve_topic(topic.lower())
+    if not idxs:
         print(f"⚠️ No questions found for '{topic}'. Returning random mix.")
-        topic_df = df
-    sample_size = min(num_questions, len(topic_df))
-    quiz_df = topic_df.sample(n=sample_size)
-    return quiz_df.to_dict(orient="records")
+    pool = idxs if idxs else ALL_RECORDS
+    picks = random.sample(pool, k=min(num_questions, len(pool)))
+    return [RECORDS[i] for i in picks]
 def analyze_performance(results: list):
     if not results:
         return "No data to analyze."
-    score_map = {}
-    for res in results:
-        topic = res.get('topic', 'General')
-        correct = 1 if res.get('is_correct') else 0
-        if topic not in score_map:
-            score_map[topic] = []
-        score_map[topic].append(correct)
-    feedback_lines = []
-    for topic, scores in score_map.items():
-        avg = sum(scores) / len(scores)
-        if avg < 0.5: 
-            feedback_lines.append(f"Weakness detected in {topic}. Review the lecture notes.")
-        elif avg == 1.0:
-            feedback_lines.append(f"Perfect score in {topic}! Moving to advanced mode.")
-        else:
-            feedback_lines.append(f"Good progress in {topic}. Keep practicing.")
-    return " ".join(feedback_lines)
\ No newline at end of file
+    topics = np.fromiter((res.get('topic', 'General') for res in results), dtype=object, count=len(results))
+    corrects = np.fromiter((1 if res.get('is_correct') else 0 for res in results), dtype=np.int8, count=len(results))
+    uniq, first_seen, inv = np.unique(topics, return_index=True, return_inverse=True)
+    sums = np.bincount(inv, weights=corrects)
+    cnts = np.bincount(inv)
+    avgs = sums / cnts
+    idx = np.where(avgs == 1.0, 2, np.where(avgs < 0.5, 0, 1))
+    order = np.argsort(first_seen)
+    return " ".join([TEMPLATES[i].format(t) for t, i in zip(uniq[order], idx[order])])
\ No newline at end of file
@@ -1,13 +1,149 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 import chromadb
-client = chromadb.PersistentClient(path="vector_store")
-collection = client.get_collection(name="exam_knowledge")
-def search_knowledge(query: str, n_results=2):
-    results = collection.query(
-        query_texts=[query],
-        n_results=n_results
-    )
-    if not results['documents'][0]:
-        return "No relevant textbook info found."
-    best_context = " ".join(results['documents'][0])
-    topic = results['metadatas'][0][0].get('topic', 'General')
-    return best_context, topic
\ No newline at end of file
+import numpy as np
+from app.embeddings import QuantizedEmbeddingFunction
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL = 3600
+NEAR_DUPLICATE_THRESHOLD = 0.92
+BATCH_WINDOW = 0.005
+MAX_BATCH_SIZE = 32
+@lru_cache(maxsize=1)
+def _get_collection():
+    client = chromadb.PersistentClient(path="vector_store")
+    return client.get_collection(name="exam_knowledge")
+collection = _get_collection()
+embedder = QuantizedEmbeddingFunction()
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+_cache_vectors = None
+_cache_slots = [None] * RESULT_CACHE_SIZE
+_free_slots = list(range(RESULT_CACHE_SIZE))
+_batch_queue = None
+_batcher = None
+_batch_loop = None
+def _normalize(query: str):
+    return " ".join(query.lower().split())
+def _cache_evict(key):
+    _, slot, _ = _result_cache.pop(key)
+    _cache_vectors[slot] = 0
+    _cache_slots[slot] = None
+    _free_slots.append(slot)
+def _cache_get(key, vec=None):
+    now = time.monotonic()
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is not None:
+            if entry[0] >= now:
+                _result_cache.move_to_end(key)
+                return entry[2]
+            _cache_evict(key)
+        if vec is None or _cache_vectors is None:
+            return None
+        sims = _cache_vectors @ vec
+        for slot in np.argsort(-sims):
+            if sims[slot] <= NEAR_DUPLICATE_THRESHOLD:
+                break
+            cached_key = _cache_slots[slot]
+            if cached_key is None or cached_key[1] != key[1]:
+                continue
+            expires, _, result = _result_cache[cached_key]
+            if expires < now:
+                _cache_evict(cached_key)
+                continue
+            return result
+        return None
+def _cache_put(key, vec, result):
+    global _cache_vectors
+    with _result_cache_lock:
+        if _cache_vectors is None:
+            _cache_vectors = np.zeros((RESULT_CACHE_SIZE, len(vec)), dtype=np.float32)
+        if key in _result_cache:
+            _cache_evict(key)
+        while not _free_slots:
+            _cache_evict(next(iter(_result_cache)))
+        slot = _free_slots.pop()
+        _cache_vectors[slot] = vec
+        _cache_slots[slot] = key
+        _result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL, slot, result)
+def warm_up():
+    vecs = embedder.encode(["warm up"])
+    collection.query(query_embeddings=[vecs[0]], n_results=1)
+def _search_batch(keys):
+    vecs = embedder.encode([key[0] for key in keys], batch_size=MAX_BATCH_SIZE)
+    found = [None] * len(keys)
+    pending = {}
+    for i, (key, vec) in enumerate(zip(keys, vecs)):
+        found[i] = _cache_get(key, vec)
+        if found[i] is None:
+            pending.setdefault(key[1], []).append(i)
+    for n_results, idxs in pending.items():
+        results = collection.query(
+            query_embeddings=[vecs[i] for i in idxs],
+            n_results=n_results
+        )
+        for row, i in enumerate(idxs):
+            if not results['documents'][row]:
+                found[i] = ("No relevant textbook info found.", "General")
+                continue
+            best_context = " ".join(results['documents'][row])
+            topic = results['metadatas'][row][0].get('topic', 'General')
+            found[i] = (best_context, topic)
+            _cache_put(keys[i], vecs[i], found[i])
+    return found
+async def _run_batcher(queue):
+    batch = []
+    try:
+        while True:
+            batch = [await queue.get()]
+            await asyncio.sleep(BATCH_WINDOW)
+            while len(batch) < MAX_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                found = await asyncio.to_thread(_search_batch, [key for key, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, found):
+                if not future.done():
+                    future.set_result(result)
+            batch = []
+    finally:
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        for _, future in batch:
+            if not future.done():
+                future.cancel()
+def _ensure_batcher():
+    global _batch_queue, _batcher, _batch_loop
+    loop = asyncio.get_running_loop()
+    if _batcher is None or _batcher.done() or _batch_loop is not loop:
+        _batch_queue = asyncio.Queue()
+        _batch_loop = loop
+        _batcher = loop.create_task(_run_batcher(_batch_queue))
+async def start_batcher():
+    _ensure_batcher()
+async def stop_batcher():
+    global _batcher
+    if _batcher is None:
+        return
+    _batcher.cancel()
+    try:
+        await _batcher
+    except asyncio.CancelledError:
+        pass
+    _batcher = None
+async def search_knowledge(query: str, n_results=2):
+    key = (_normalize(query), n_results)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    _ensure_batcher()
+    future = asyncio.get_running_loop().create_future()
+    await _batch_queue.put((key, future))
+    return await future
\ No newline at end of file
@@ -1,71 +1,74 @@
-import requests
-import json
+import asyncio
+import httpx
 import time
 BASE_URL = "http://127.0.0.1:8000"
+LOAD_CONCURRENCY = 20
 GREEN = "\033[92m"
 RED = "\033[91m"
 RESET = "\033[0m"
 BOLD = "\033[1m"
 def print_pass(message):
     print(f"{GREEN} PASS:{RESET} {message}")
+def print_header(title):
+    print(f"\n{BOLD}--- {title} ---{RESET}")
 def print_fail(message, error=""):
     print(f"{RED} FAIL:{RESET} {message}")
     if error:
         print(f"   Error: {error}")
-def test_root():
-    print(f"\n{BOLD}--- Test 1: Health Check ---{RESET}")
+async def test_root(client):
+    print_header("Test 1: Health Check")
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = await client.get("/")
         if response.status_code == 200:
             print_pass("Server is online and healthy.")
             return True
         else:
             print_fail(f"Server returned status {response.status_code}")
             return False
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print_fail("Could not connect. Is the server running?", "Run 'uvicorn app.main:app --reload' in a separate terminal.")
         return False
-def test_rag_search():
-    print(f"\n{BOLD}--- Test 2: RAG Search Engine ---{RESET}")
-    endpoint = f"{BASE_URL}/retrieve"
+async def test_rag_search(client):
     payload = {"question_text": "What is the function of the mitochondria?"}
     try:
-        start = time.time()
-        response = requests.post(endpoint, json=payload)
-        duration = time.time() - start
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("answer_context"):
-                print_pass(f"Got answer in {duration:.2f}s")
-                print(f"   Topic Found: {data.get('source_topic')}")
-                print(f"   Context Snippet: {data.get('answer_context')[:100]}...")
-            else:
-                print_fail("Response missing 'answer_context'. DB might be empty.")
-        else:
-            print_fail(f"Status {response.status_code}", response.text)
+        start = time.perf_counter()
+        response = await client.post("/retrieve", json=payload)
+        duration = time.perf_counter() - start
     except Exception as e:
+        print_header("Test 2: RAG Search Engine")
         print_fail("Request failed", str(e))
-def test_quiz_generator():
-    print(f"\n{BOLD}--- Test 3: Quiz Generator ---{RESET}")
-    endpoint = f"{BASE_URL}/quiz/generate"
+        return
+    print_header("Test 2: RAG Search Engine")
+    if response.status_code == 200:
+        data = response.json()
+        if data.get("answer_context"):
+            print_pass(f"Got answer in {duration:.2f}s")
+            print(f"   Topic Found: {data.get('source_topic')}")
+            print(f"   Context Snippet: {data.get('answer_context')[:100]}...")
+        else:
+            print_fail("Response missing 'answer_context'. DB might be empty.")
+    else:
+        print_fail(f"Status {response.status_code}", response.text)
+async def test_quiz_generator(client):
     payload = {"topic": "science", "difficulty": "Medium"}
     try:
-        response = requests.post(endpoint, json=payload)
-        if response.status_code == 200:
-            data = response.json()
-            quiz = data.get("quiz", [])
-            if len(quiz) > 0:
-                print_pass(f"Generated {len(quiz)} questions for 'science'.")
-                print(f"   Sample Question: {quiz[0].get('prompt')}")
-            else:
-                print_fail("Returned empty quiz list.")
-        else:
-            print_fail(f"Status {response.status_code}", response.text)
+        response = await client.post("/quiz/generate", json=payload)
     except Exception as e:
+        print_header("Test 3: Quiz Generator")
         print_fail("Request failed", str(e))
-def test_analytics():
-    print(f"\n{BOLD}--- Test 4: Analytics Engine ---{RESET}")
-    endpoint = f"{BASE_URL}/quiz/analyze"
+        return
+    print_header("Test 3: Quiz Generator")
+    if response.status_code == 200:
+        data = response.json()
+        quiz = data.get("quiz", [])
+        if len(quiz) > 0:
+            print_pass(f"Generated {len(quiz)} questions for 'science'.")
+            print(f"   Sample Question: {quiz[0].get('prompt')}")
+        else:
+            print_fail("Returned empty quiz list.")
+    else:
+        print_fail(f"Status {response.status_code}", response.text)
+async def test_analytics(client):
     payload = {
         "results": [
             {"question_id": "1", "topic": "Biology", "is_correct": False},
@@ -75,23 +78,47 @@ def test_analytics():
         ]
     }
     try:
-        response = requests.post(endpoint, json=payload)
-        if response.status_code == 200:
-            data = response.json()
-            feedback = data.get("feedback", "")
-            if "Weakness" in feedback:
-                print_pass("Analytics correctly identified weakness.")
-                print(f"   Feedback: {feedback}")
-            else:
-                print_fail("Feedback logic seems off.", f"Got: {feedback}")
-        else:
-            print_fail(f"Status {response.status_code}", response.text)
+        response = await client.post("/quiz/analyze", json=payload)
     except Exception as e:
+        print_header("Test 4: Analytics Engine")
         print_fail("Request failed", str(e))
+        return
+    print_header("Test 4: Analytics Engine")
+    if response.status_code == 200:
+        data = response.json()
+        feedback = data.get("feedback", "")
+        if "Weakness" in feedback:
+            print_pass("Analytics correctly identified weakness.")
+            print(f"   Feedback: {feedback}")
+        else:
+            print_fail("Feedback logic seems off.", f"Got: {feedback}")
+    else:
+        print_fail(f"Status {response.status_code}", response.text)
+async def test_load(client, n=LOAD_CONCURRENCY):
+    print_header(f"Test 5: Concurrent Load ({n} x 3 requests)")
+    calls = [
+        lambda i: client.post("/retrieve", json={"question_text": f"What is the function of the mitochondria? ({i})"}),
+        lambda i: client.post("/quiz/generate", json={"topic": "science", "difficulty": "Medium"}),
+        lambda i: client.post("/quiz/analyze", json={"results": [{"question_id": str(i), "topic": "Biology", "is_correct": True}]})
+    ]
+    start = time.perf_counter()
+    responses = await asyncio.gather(*[call(i) for call in calls for i in range(n)], return_exceptions=True)
+    duration = time.perf_counter() - start
+    failures = [r for r in responses if isinstance(r, Exception) or r.status_code != 200]
+    if failures:
+        print_fail(f"{len(failures)}/{len(responses)} requests failed in {duration:.2f}s", str(failures[0]))
+    else:
+        print_pass(f"{len(responses)} concurrent requests succeeded in {duration:.2f}s")
+async def main():
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30) as client:
+        if await test_root(client):
+            await asyncio.gather(
+                test_rag_search(client),
+                test_quiz_generator(client),
+                test_analytics(client)
+            )
+            await test_load(client)
 if __name__ == "__main__":
     print(f"{BOLD} Starting System Diagnostics...{RESET}")
-    if test_root():
-        test_rag_search()
-        test_quiz_generator()
-        test_analytics()
+    asyncio.run(main())
     print(f"\n{BOLD} Tests Completed.{RESET}")
\ No newline at end of file
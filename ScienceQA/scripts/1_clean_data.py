@@ -1,26 +1,26 @@
 import pandas as pd
-import json
+import orjson
 import os
 INPUT_FILE = "data/ScienceQA_with_context2.csv"
 OUTPUT_FILE = "data/cleaned_exam.json"
+FEATHER_FILE = "data/cleaned_exam.feather"
 def clean_data():
     print("Starting data cleaning...")
     if not os.path.exists(INPUT_FILE):
         print(f"Error: File {INPUT_FILE} not found!")
         return
     df = pd.read_csv(INPUT_FILE)
-    def format_choices(row):
-        choices = {}
-        for opt in ['A', 'B', 'C', 'D', 'E']:
-            if opt in row and pd.notna(row[opt]):
-                choices[opt] = row[opt]
-        return choices
-    df['choices'] = df.apply(format_choices, axis=1)
+    opt_cols = [c for c in ['A', 'B', 'C', 'D', 'E'] if c in df.columns]
+    mask = {c: df[c].notna().to_numpy() for c in opt_cols}
+    vals = {c: df[c].to_numpy(dtype=object) for c in opt_cols}
+    df['choices'] = [{c: vals[c][i] for c in opt_cols if mask[c][i]} for i in range(len(df))]
     wanted_cols = ['id', 'prompt', 'lecture', 'solution', 'subject', 'topic', 'choices', 'answer', 'image']
     existing_cols = [c for c in wanted_cols if c in df.columns]
     df_clean = df[existing_cols]
     df_clean = df_clean.dropna(subset=['prompt', 'lecture'])
-    df_clean.to_json(OUTPUT_FILE, orient="records", indent=4)
-    print(f"Success! Saved {len(df_clean)} questions to {OUTPUT_FILE}")
+    with open(OUTPUT_FILE, 'wb') as f:
+        f.write(orjson.dumps(df_clean.to_dict(orient="records"), option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    df_clean.reset_index(drop=True).to_feather(FEATHER_FILE)
+    print(f"Success! Saved {len(df_clean)} questions to {OUTPUT_FILE} and {FEATHER_FILE}")
 if __name__ == "__main__":
     clean_data()
\ No newline at end of file
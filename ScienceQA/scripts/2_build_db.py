@@ -1,49 +1,77 @@
-import json
+import hashlib
+import orjson
 import chromadb
-from chromadb.utils import embedding_functions
 import os
+import sys
+from pyarrow import feather
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.embeddings import QuantizedEmbeddingFunction
 DATA_FILE = "data/cleaned_exam.json"
+FEATHER_FILE = "data/cleaned_exam.feather"
 DB_PATH = "vector_store" 
+ENCODE_BATCH_SIZE = 256
+def iter_documents(data):
+    for item in data:
+        combined_text = f"Question: {item.get('prompt', '')} Context: {item.get('lecture', '')}"
+        yield str(item['id']), combined_text, {
+            "subject": str(item.get('subject') or "General"),
+            "topic": str(item.get('topic') or "General"),
+            "solution": str(item.get('solution') or "")
+        }
+def add_batch(collection, model, ids, docs, metas):
+    embeddings = model.encode(docs, batch_size=ENCODE_BATCH_SIZE)
+    collection.add(ids=ids, documents=docs, metadatas=metas, embeddings=embeddings)
 def build_knowledge_base():
     print("Building Vector Database...")
-    if not os.path.exists(DATA_FILE):
-        print(f"Error: {DATA_FILE} not found. Did you run script 1?")
+    if os.path.exists(FEATHER_FILE):
+        data = feather.read_table(FEATHER_FILE).to_pylist()
+    elif os.path.exists(DATA_FILE):
+        with open(DATA_FILE, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        print(f"Error: {FEATHER_FILE} / {DATA_FILE} not found. Did you run script 1?")
         return
-    with open(DATA_FILE, 'r') as f:
-        data = json.load(f)
     client = chromadb.PersistentClient(path=DB_PATH)
     try:
         client.delete_collection(name="exam_knowledge")
     except:
         pass
-    ef = embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
-    collection = client.create_collection(name="exam_knowledge", embedding_function=ef)
-    ids = []
-    documents = [] 
-    metadatas = [] 
+    model = QuantizedEmbeddingFunction()
+    collection = client.create_collection(
+        name="exam_knowledge",
+        embedding_function=None,
+        configuration={
+            "hnsw": {
+                "space": "cosine",
+                "ef_construction": 200,
+                "max_neighbors": 32,
+                "ef_search": 32
+            }
+        }
+    )
     print(f"Processing {len(data)} items...")
-    for item in data:
-        combined_text = f"Question: {item.get('prompt', '')} Context: {item.get('lecture', '')}"
-        ids.append(str(item['id']))
-        documents.append(combined_text) 
-        metadatas.append({
-            "subject": str(item.get('subject') or "General"),
-            "topic": str(item.get('topic') or "General"),
-            "solution": str(item.get('solution') or "") 
-        })
     batch_size = 500
-    total_batches = len(ids) // batch_size + 1
-    for i in range(0, len(ids), batch_size):
-        batch_ids = ids[i:i+batch_size]
-        batch_docs = documents[i:i+batch_size]
-        batch_meta = metadatas[i:i+batch_size]
-        if batch_ids:
-            collection.add(
-                ids=batch_ids,
-                documents=batch_docs,
-                metadatas=batch_meta
-            )
-            print(f"   Added batch {i//batch_size + 1}/{total_batches}...")
+    batch_ids, batch_docs, batch_meta = [], [], []
+    seen = set()
+    added = skipped = 0
+    for doc_id, doc, meta in iter_documents(data):
+        digest = hashlib.blake2b(doc.encode(), digest_size=16).digest()
+        if digest in seen:
+            skipped += 1
+            continue
+        seen.add(digest)
+        batch_ids.append(doc_id)
+        batch_docs.append(doc)
+        batch_meta.append(meta)
+        if len(batch_ids) == batch_size:
+            add_batch(collection, model, batch_ids, batch_docs, batch_meta)
+            added += len(batch_ids)
+            print(f"   Added {added} documents...")
+            batch_ids, batch_docs, batch_meta = [], [], []
+    if batch_ids:
+        add_batch(collection, model, batch_ids, batch_docs, batch_meta)
+        added += len(batch_ids)
+    print(f"   Added {added} documents, skipped {skipped} duplicates.")
     print("Database built successfully in /vector_store!")
 if __name__ == "__main__":
     build_knowledge_base()
\ No newline at end of file